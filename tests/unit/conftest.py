@@ -0,0 +1,48 @@
+###############################################################################
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+###############################################################################
+
+import os
+
+# wis2box.env refuses to import without these settings. Unit tests mock
+# every service, so placeholder values are enough
+ENVIRONMENT = {
+    'WIS2BOX_DATADIR': 'tests/data',
+    'WIS2BOX_DOCKER_API_URL': 'http://localhost/oapi',
+    'WIS2BOX_URL': 'http://localhost',
+    'WIS2BOX_API_TYPE': 'pygeoapi',
+    'WIS2BOX_API_URL': 'http://localhost/oapi',
+    'WIS2BOX_API_BACKEND_TYPE': 'SensorThings',
+    'WIS2BOX_API_BACKEND_URL': 'http://localhost/FROST-Server/v1.1',
+    'WIS2BOX_BROKER_HOST': 'localhost',
+    'WIS2BOX_BROKER_PORT': '1883',
+    'WIS2BOX_BROKER_USERNAME': 'wis2box',
+    'WIS2BOX_BROKER_PASSWORD': 'wis2box',
+    'WIS2BOX_BROKER_PUBLIC': 'mqtt://localhost:1883',
+    'WIS2BOX_STORAGE_TYPE': 'S3',
+    'WIS2BOX_STORAGE_SOURCE': 'http://localhost:9000',
+    'WIS2BOX_STORAGE_USERNAME': 'minio',
+    'WIS2BOX_STORAGE_PASSWORD': 'minio123',
+    'WIS2BOX_STORAGE_INCOMING': 'wis2box-incoming',
+    'WIS2BOX_STORAGE_PUBLIC': 'wis2box-public'
+}
+
+for key, value in ENVIRONMENT.items():
+    os.environ.setdefault(key, value)
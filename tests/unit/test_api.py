@@ -0,0 +1,222 @@
+###############################################################################
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+###############################################################################
+
+from unittest.mock import Mock, patch
+
+import pytest
+from requests import HTTPError
+
+from wis2box.api import setup_collections, upsert_collection_items
+from wis2box.api.config.pygeoapi import PygeoapiConfig
+
+
+@pytest.fixture
+def backend():
+    """Mocked API backend returned by load_backend"""
+
+    backend = Mock()
+    with patch('wis2box.api.load_backend', return_value=backend):
+        yield backend
+
+
+@pytest.fixture
+def api_config():
+    """Mocked API configuration returned by load_config"""
+
+    api_config = Mock()
+    with patch('wis2box.api.load_config', return_value=api_config):
+        yield api_config
+
+
+def batch_sizes(backend):
+    """Sizes of the batches handed to the backend, in item order"""
+
+    batches = [call.args[1] for call in
+               backend.upsert_collection_items.call_args_list]
+    return [len(batch) for batch in sorted(batches, key=lambda b: b[0])]
+
+
+def test_upsert_collection_items_batches(backend):
+    """Test items are split into batches of at most BATCH_SIZE"""
+
+    backend.upsert_collection_items.return_value = True
+
+    with patch('wis2box.api.BATCH_SIZE', 2):
+        assert upsert_collection_items('Things', [0, 1, 2, 3, 4])
+
+    assert batch_sizes(backend) == [2, 2, 1]
+    for call in backend.upsert_collection_items.call_args_list:
+        assert call.args[0] == 'Things'
+        assert call.args[2] == 'POST'
+
+
+def test_upsert_collection_items_isolates_failures(backend):
+    """Test a failing batch does not stop the remaining batches"""
+
+    def upsert(collection_id, batch, method):
+        if 2 in batch:
+            raise ValueError('backend error')
+        return True
+
+    backend.upsert_collection_items.side_effect = upsert
+
+    with patch('wis2box.api.BATCH_SIZE', 2):
+        assert not upsert_collection_items('Things', [0, 1, 2, 3, 4])
+
+    assert batch_sizes(backend) == [2, 2, 1]
+
+
+def test_upsert_collection_items_reports_failure(backend):
+    """Test a batch reporting failure fails the upsert"""
+
+    backend.upsert_collection_items.side_effect = [False]
+
+    assert not upsert_collection_items('Things', [0, 1])
+
+
+def test_upsert_collection_items_empty():
+    """Test nothing is sent for an empty list of items"""
+
+    with patch('wis2box.api.load_backend') as load_backend:
+        assert upsert_collection_items('Things', [])
+
+    load_backend.assert_not_called()
+
+
+def test_setup_collections_single(backend, api_config):
+    """Test a single missing collection is added on its own"""
+
+    backend.has_collection.return_value = True
+    api_config.has_collection.side_effect = lambda name: name == 'things'
+    api_config.prepare_collection.side_effect = lambda meta: meta['id']
+
+    assert setup_collections([{'id': 'Things'},
+                             {'id': 'Datastreams'}])
+
+    api_config.add_collection.assert_called_once_with(
+        'datastreams', 'Datastreams')
+    api_config.add_collections.assert_not_called()
+
+
+def test_setup_collections_many(backend, api_config):
+    """Test missing collections are added in a single request"""
+
+    backend.has_collection.return_value = False
+    api_config.has_collection.return_value = False
+    api_config.prepare_collection.side_effect = lambda meta: meta['id']
+
+    assert setup_collections([{'id': 'Things'},
+                             {'id': 'Datastreams'}])
+
+    backend.add_collection.assert_any_call('Things')
+    backend.add_collection.assert_any_call('Datastreams')
+    api_config.add_collections.assert_called_once_with({
+        'things': 'Things',
+        'datastreams': 'Datastreams'
+    })
+    api_config.add_collection.assert_not_called()
+
+
+def test_setup_collections_invalid(backend, api_config):
+    """Test collection metadata without an id is rejected"""
+
+    assert not setup_collections([{'title': 'Things'}])
+
+
+@pytest.fixture
+def pygeoapi_config():
+    """pygeoapi configuration with a mocked Session"""
+
+    api_config = PygeoapiConfig({})
+    api_config.http = Mock()
+    return api_config
+
+
+def response(status_code):
+    """Builds a response with the given status code"""
+
+    r = Mock(status_code=status_code, ok=status_code < 400, text='')
+    if status_code >= 400:
+        r.raise_for_status.side_effect = HTTPError(str(status_code))
+    return r
+
+
+def test_add_collection(pygeoapi_config):
+    """Test a new collection is added with a single POST"""
+
+    pygeoapi_config.http.post.return_value = response(201)
+
+    assert pygeoapi_config.add_collection('things', {})
+
+    pygeoapi_config.http.get.assert_not_called()
+    pygeoapi_config.http.put.assert_not_called()
+
+
+def test_add_collection_exists(pygeoapi_config):
+    """Test an existing collection is updated after a rejected POST"""
+
+    pygeoapi_config.http.post.return_value = response(400)
+    pygeoapi_config.http.get.return_value = response(200)
+    pygeoapi_config.http.put.return_value = response(204)
+
+    assert pygeoapi_config.add_collection('things', {})
+
+    url = pygeoapi_config.http.put.call_args.args[0]
+    assert url == f'{pygeoapi_config.url}/things'
+
+
+def test_add_collection_invalid(pygeoapi_config):
+    """Test a rejected POST for a missing collection raises"""
+
+    pygeoapi_config.http.post.return_value = response(400)
+    pygeoapi_config.http.get.return_value = response(404)
+
+    with pytest.raises(HTTPError):
+        pygeoapi_config.add_collection('things', {})
+
+    pygeoapi_config.http.put.assert_not_called()
+
+
+def test_add_collections(pygeoapi_config):
+    """Test collections are added in a single POST"""
+
+    pygeoapi_config.http.post.return_value = response(201)
+
+    assert pygeoapi_config.add_collections({'things': {}, 'sensors': {}})
+    assert pygeoapi_config.http.post.call_count == 1
+
+
+def test_add_collections_fallback(pygeoapi_config):
+    """Test collections are added one by one if the batch is rejected"""
+
+    pygeoapi_config.http.post.side_effect = [
+        response(400), response(201), response(201)
+    ]
+
+    assert pygeoapi_config.add_collections({'things': {}, 'sensors': {}})
+
+    posted = [call.kwargs['json'] for call in
+              pygeoapi_config.http.post.call_args_list]
+    assert posted == [
+        {'things': {}, 'sensors': {}},
+        {'things': {}},
+        {'sensors': {}}
+    ]
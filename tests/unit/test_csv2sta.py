@@ -0,0 +1,143 @@
+###############################################################################
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+###############################################################################
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from wis2box.data.csv2sta import ObservationDataCSV
+
+HEADER = b'''"Title"
+"Description"
+"Generated"
+"Location","Parameter","Coordinates (long, lat)"
+"Dam X","Stage","(-105.1, 40.2)"
+""
+""
+"Datetime (UTC)","Result","Parameter"
+'''
+
+
+@pytest.fixture
+def plugin():
+    """CSV observation plugin for the demo topic hierarchy"""
+
+    return ObservationDataCSV({
+        'topic_hierarchy': 'iow.demo.Observations',
+        'template': None,
+        'pattern': '^.*csv$',
+        'notify': False,
+        'buckets': ()
+    })
+
+
+def transform(plugin, rows):
+    """Transforms CSV data rows for datastream 123"""
+
+    data = HEADER + b'\n'.join(rows) + b'\n'
+    return dict(plugin.transform_iter(data, '123_observations.csv'))
+
+
+def test_transform(plugin):
+    """Test observations are built from the header and data rows"""
+
+    output = transform(plugin, [
+        b'"2024-01-01 00:00:00",1.5,"Stage"',
+        b'"2024-01-02T01:02:03","NaN?","Stage"'
+    ])
+
+    assert list(output) == ['123_20240101T000000', '123_20240102T010203']
+
+    first = output['123_20240101T000000']
+    assert first['_meta'] == {
+        'identifier': '123_20240101T000000',
+        'data_date': '2024-01-01T00:00:00Z',
+        'relative_filepath': Path('2024-01-01/wis/iow/demo/Observations')
+    }
+    assert first['geojson']['phenomenonTime'] == '2024-01-01T00:00:00Z'
+    assert first['geojson']['resultTime'] == '2024-01-01T00:00:00Z'
+    assert first['geojson']['result'] == 1.5
+    assert first['geojson']['Datastream'] == {'@iot.id': '123'}
+    assert first['geojson']['FeatureOfInterest'] == {
+        '@iot.id': '123',
+        'name': 'Dam X',
+        'description': 'Stage',
+        'encodingType': 'application/vnd.geo+json',
+        'feature': {
+            'type': 'Point',
+            'coordinates': [-105.1, 40.2]
+        }
+    }
+
+    second = output['123_20240102T010203']
+    assert second['_meta']['data_date'] == '2024-01-02T01:02:03Z'
+    assert second['geojson']['result'] == 'NaN?'
+
+
+def test_transform_shares_feature_of_interest(plugin):
+    """Test rows with the same parameter share a feature of interest"""
+
+    output = transform(plugin, [
+        b'"2024-01-01 00:00:00",1.0,"Stage"',
+        b'"2024-01-01 01:00:00",2.0,"Stage"',
+        b'"2024-01-01 02:00:00",3.0,"Flow"'
+    ])
+    fois = [item['geojson']['FeatureOfInterest']
+            for item in output.values()]
+
+    assert fois[0] is fois[1]
+    assert fois[2]['description'] == 'Flow'
+    assert fois[0]['description'] == 'Stage'
+
+
+@pytest.mark.parametrize('datetime_', [
+    '2024-01-01',
+    '2024-01-01 00:00',
+    '2024-01-01 00:00:00.500000',
+    '2024-01-01 00:00:00+00:00',
+    '2024-01-01T00+01:00',
+    '01/01/2024 00:00:00'
+])
+def test_transform_rejects_invalid_datetime(plugin, datetime_):
+    """Test datetimes the former strptime format rejected still fail"""
+
+    row = f'"{datetime_}",1.0,"Stage"'.encode()
+
+    with pytest.raises(ValueError):
+        transform(plugin, [row])
+
+
+def test_publish(plugin):
+    """Test all observations are handed to one bulk upsert"""
+
+    plugin.output_data = transform(plugin, [
+        b'"2024-01-01 00:00:00",1.0,"Stage"',
+        b'"2024-01-01 01:00:00",2.0,"Stage"'
+    ])
+
+    with patch('wis2box.data.csv2sta.upsert_collection_items',
+               return_value=True) as upsert:
+        assert plugin.publish()
+
+    collection_id, items = upsert.call_args.args
+    assert collection_id == 'Observations'
+    assert [item['result'] for item in items] == [1.0, 2.0]
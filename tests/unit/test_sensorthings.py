@@ -0,0 +1,127 @@
+###############################################################################
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+###############################################################################
+
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from wis2box.api.backend.sensorthings import SensorthingsBackend
+
+URL = 'http://localhost/FROST-Server/v1.1'
+
+
+@pytest.fixture
+def backend():
+    """SensorThings backend with a mocked Session"""
+
+    backend = SensorthingsBackend({'url': URL})
+    backend.http = Mock()
+    return backend
+
+
+def batch_response(*statuses):
+    """Builds a $batch response with one sub-response per status"""
+
+    return Mock(ok=True, json=Mock(return_value={'responses': [
+        {'id': str(i), 'status': status}
+        for i, status in enumerate(statuses)
+    ]}))
+
+
+def test_single_item_upsert(backend):
+    """Test a single item is POSTed directly"""
+
+    backend.http.post.return_value = Mock(ok=True)
+
+    assert backend.upsert_collection_items('Things', [{'@iot.id': 'a'}])
+
+    url = backend.http.post.call_args.args[0]
+    assert url == f'{URL}/Things'
+
+
+def test_batch_request(backend):
+    """Test multiple items are sent as one $batch request"""
+
+    items = [{'@iot.id': 'a'}, {'@iot.id': 'b'}]
+    backend.http.post.return_value = batch_response(201, 201)
+
+    assert backend.upsert_collection_items('iow.demo.Things', items)
+    assert backend.http.post.call_count == 1
+
+    url = backend.http.post.call_args.args[0]
+    body = json.loads(backend.http.post.call_args.kwargs['data'])
+
+    assert url == f'{URL}/$batch'
+    assert body == {'requests': [
+        {'id': '0', 'method': 'post', 'url': 'Things', 'body': items[0]},
+        {'id': '1', 'method': 'post', 'url': 'Things', 'body': items[1]}
+    ]}
+
+
+def test_batch_request_patch(backend):
+    """Test PATCH $batch requests address each entity by id"""
+
+    items = [{'@iot.id': 'a'}, {'@iot.id': 'b'}]
+    backend.http.post.return_value = batch_response(200, 200)
+
+    assert backend.upsert_collection_items('Things', items, 'PATCH')
+
+    body = json.loads(backend.http.post.call_args.kwargs['data'])
+    assert [r['method'] for r in body['requests']] == ['patch', 'patch']
+    assert [r['url'] for r in body['requests']] == [
+        "Things('a')", "Things('b')"]
+
+
+def test_batch_failures(backend, caplog):
+    """Test failed $batch sub-requests are mapped back to their items"""
+
+    items = [{'@iot.id': 'a'}, {'@iot.id': 'b'}, {'@iot.id': 'c'}]
+    backend.http.post.return_value = batch_response(201, 400, 500)
+
+    assert not backend.upsert_collection_items('Things', items)
+
+    errors = [r.getMessage() for r in caplog.records
+              if r.levelname == 'ERROR']
+    assert len(errors) == 3
+    assert errors[0].startswith('Failed to POST Things b:')
+    assert errors[1].startswith('Failed to POST Things c:')
+    assert errors[2] == '2 of 3 Things failed'
+
+
+def test_batch_failure_without_id(backend):
+    """Test a failed sub-request without a usable id is still counted"""
+
+    items = [{'@iot.id': 'a'}, {'@iot.id': 'b'}]
+    backend.http.post.return_value = Mock(ok=True, json=Mock(return_value={
+        'responses': [{'id': '0', 'status': 201}, {'status': 400}]
+    }))
+
+    assert not backend.upsert_collection_items('Things', items)
+
+
+def test_batch_rejected(backend):
+    """Test a rejected $batch request fails the whole batch"""
+
+    items = [{'@iot.id': 'a'}, {'@iot.id': 'b'}]
+    backend.http.post.return_value = Mock(ok=False, content=b'error')
+
+    assert not backend.upsert_collection_items('Things', items)
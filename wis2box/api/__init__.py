@@ -20,6 +20,7 @@
 ###############################################################################
 
 import click
+from concurrent.futures import ThreadPoolExecutor
 import logging
 
 from wis2box.api.backend import load_backend
@@ -28,6 +29,10 @@ from wis2box import cli_helpers
 
 LOGGER = logging.getLogger(__name__)
 
+# items per bulk backend request, and bulk requests sent concurrently
+BATCH_SIZE = 500
+MAX_WORKERS = 8
+
 
 def setup_collection(meta: dict = {}) -> bool:
     """
@@ -38,33 +43,56 @@ def setup_collection(meta: dict = {}) -> bool:
     :returns: `bool` of API collection setup result
     """
 
-    try:
-        name = meta['id'].lower()
-    except KeyError:
-        LOGGER.error(f'Invalid configuration: {meta}')
-        return False
+    return setup_collections([meta])
 
-    if 'topic_hierarchy' in meta:
-        data_name = meta['topic_hierarchy']
-    else:
-        data_name = meta['id']
+
+def setup_collections(metas: list) -> bool:
+    """
+    Add collections to api backend and configuration, provisioning
+    any missing API configuration in a single request
+
+    :param metas: `list` of `dict` of collection metadata
+
+    :returns: `bool` of API collection setup result
+    """
 
     backend = load_backend()
-    if not backend.has_collection(data_name):
+    api_config = load_config()
 
-        if not backend.add_collection(data_name):
-            msg = f'Unable to setup backend for collection {data_name}'
-            LOGGER.error(msg)
+    collections = {}
+    for meta in metas:
+        try:
+            name = meta['id'].lower()
+        except KeyError:
+            LOGGER.error(f'Invalid configuration: {meta}')
             return False
 
-    api_config = load_config()
-    if not api_config.has_collection(name):
+        if 'topic_hierarchy' in meta:
+            data_name = meta['topic_hierarchy']
+        else:
+            data_name = meta['id']
 
-        collection = api_config.prepare_collection(meta)
+        if not backend.has_collection(data_name):
+
+            if not backend.add_collection(data_name):
+                msg = f'Unable to setup backend for collection {data_name}'
+                LOGGER.error(msg)
+                return False
+
+        if not api_config.has_collection(name):
+            collections[name] = api_config.prepare_collection(meta)
+
+    if len(collections) == 1:
+        name, collection = collections.popitem()
         if not api_config.add_collection(name, collection):
             msg = f'Unable to setup configuration for collection {name}'
             LOGGER.error(msg)
             return False
+    elif collections:
+        if not api_config.add_collections(collections):
+            msg = f'Unable to setup configuration for collections {list(collections)}'  # noqa
+            LOGGER.error(msg)
+            return False
 
     return True
 
@@ -108,6 +136,42 @@ def upsert_collection_item(collection_id: str, item: dict,
         return True
 
 
+def upsert_collection_items(collection_id: str, items: list,
+                            method: str = 'POST') -> bool:
+    """
+    Add or update collection items in bulk, split into backend requests
+    of at most BATCH_SIZE items
+
+    :param collection_id: name of collection
+    :param items: list of GeoJSON item data `dict`'s
+    :param method: `str` of HTTP method for each item
+
+    :returns: `bool` of upsert result
+    """
+    if not items:
+        return True
+
+    backend = load_backend()
+
+    def upsert(batch: list) -> bool:
+        try:
+            return bool(
+                backend.upsert_collection_items(collection_id, batch, method))
+        except Exception as err:
+            msg = f'Unable to upsert {len(batch)} items into {collection_id}'
+            LOGGER.error(f'{msg}: {err}')
+            return False
+
+    batches = [items[i:i + BATCH_SIZE]
+               for i in range(0, len(items), BATCH_SIZE)]
+    LOGGER.debug(f'Upserting {len(items)} items in {len(batches)} batches')
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results = list(executor.map(upsert, batches))
+
+    return all(results)
+
+
 def delete_collection_item(collection_id: str, item_id: str) -> str:
     """
     Delete an item from a collection
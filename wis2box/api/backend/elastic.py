@@ -180,14 +180,17 @@ class ElasticBackend(BaseBackend):
 
         return indices.exists(es_index)
 
-    def upsert_collection_items(self, collection_id: str, items: list) -> str:
+    def upsert_collection_items(self, collection_id: str, items: list,
+                                method: str = 'POST') -> bool:
         """
         Add or update collection items
 
         :param collection_id: name of collection
         :param items: list of GeoJSON item data `dict`'s
+        :param method: `str` of HTTP method (unused, documents are always
+                       indexed by identifier)
 
-        :returns: `str` identifier of added item
+        :returns: `bool` of upsert result
         """
         es_index = self.es_id(collection_id)
 
@@ -211,6 +214,7 @@ class ElasticBackend(BaseBackend):
                 }
 
         helpers.bulk(self.conn, gendata(items))
+        return True
 
     def delete_collection_item(self, collection_id: str, item_id: str) -> str:
         """
@@ -22,13 +22,29 @@
 import logging
 
 from requests import Session
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.util.retry import Retry
 from typing import Tuple
 
 from wis2box.api.backend.base import BaseBackend
-from wis2box.util import url_join, to_json
+from wis2box.util import url_join, to_json_bytes
 
 LOGGER = logging.getLogger(__name__)
 
+# shared across backend instances so that connections are pooled between
+# calls to wis2box.api.load_backend
+HTTP = Session()
+_retry_strategy = Retry(
+    total=3,
+    status_forcelist=[429, 500, 502, 503, 504],
+    backoff_factor=1
+)
+_adapter = HTTPAdapter(max_retries=_retry_strategy)
+HTTP.mount('https://', _adapter)
+HTTP.mount('http://', _adapter)
+
+HEADERS = {'Content-Type': 'application/json'}
+
 
 class SensorthingsBackend(BaseBackend):
     """SensorthingsBackend API backend"""
@@ -44,7 +60,7 @@ class SensorthingsBackend(BaseBackend):
 
         self.type = 'SensorThings'
         self.url = url_join(defs.get('url'))
-        self.http = Session()
+        self.http = HTTP
 
     def sta_id(self, collection_id: str) -> Tuple[str]:
         """
@@ -54,7 +70,7 @@ class SensorthingsBackend(BaseBackend):
 
         :returns: `str` of STA index
         """
-        entity = collection_id.split('.').pop()
+        entity = collection_id.rpartition('.')[2]
         return url_join(self.url, entity)
 
     def add_collection(self, collection_id: str) -> dict:
@@ -97,21 +113,78 @@ class SensorthingsBackend(BaseBackend):
 
         :returns: `str` identifier of added item
         """
+        if len(items) > 1:
+            return self._batch_collection_items(collection_id, items, method)
+
         sta_index = self.sta_id(collection_id)
 
         for entity in items:
             if method == 'PATCH':
                 item_id = entity['@iot.id']
                 url = f'''{sta_index}('{item_id}')'''
-                r = self.http.patch(url, data=to_json(entity))
+                r = self.http.patch(url, data=to_json_bytes(entity),
+                                    headers=HEADERS)
             else:
-                r = self.http.post(sta_index, data=to_json(entity))
+                r = self.http.post(sta_index, data=to_json_bytes(entity),
+                                   headers=HEADERS)
 
             if not r.ok:
                 LOGGER.error(r.content)
                 return False
         return True
 
+    def _batch_collection_items(self, collection_id: str, items: list,
+                                method: str = 'POST') -> bool:
+        """
+        Private function: add or update collection items in a single
+        SensorThings $batch request
+
+        :param collection_id: name of collection
+        :param items: list of GeoJSON item data `dict`'s
+        :param method: `str` of HTTP method for each item
+
+        :returns: `bool` of batch result
+        """
+
+        entity = collection_id.rpartition('.')[2]
+        is_patch = method == 'PATCH'
+        batch_method = method.lower()
+
+        # PATCH addresses each entity by id; POST targets the entity set
+        batch_request = {'requests': [{
+            'id': str(request_id),
+            'method': batch_method,
+            'url': f"{entity}('{item['@iot.id']}')" if is_patch else entity,
+            'body': item
+        } for request_id, item in enumerate(items)]}
+
+        r = self.http.post(url_join(self.url, '$batch'),
+                           data=to_json_bytes(batch_request),
+                           headers=HEADERS)
+
+        if not r.ok:
+            LOGGER.error(r.content)
+            return False
+
+        failures = 0
+        for response in r.json().get('responses', []):
+            if response.get('status', 500) < 400:
+                continue
+
+            failures += 1
+            try:
+                item_id = items[int(response['id'])].get('@iot.id')
+            except (KeyError, IndexError, TypeError, ValueError):
+                item_id = None
+            LOGGER.error(f'Failed to {method} {entity} {item_id}: '
+                         f'{response}')
+
+        if failures:
+            LOGGER.error(f'{failures} of {len(items)} {entity} failed')
+            return False
+
+        return True
+
     def delete_collection_item(self, collection_id: str, item_id: str) -> str:
         """
         Delete an item from a collection
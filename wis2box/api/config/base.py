@@ -45,6 +45,18 @@ class BaseConfig:
 
         raise NotImplementedError()
 
+    def add_collections(self, collections: dict) -> bool:
+        """
+        Add a number of collections
+
+        :param collections: `dict` of collection properties keyed by
+                            collection name
+
+        :returns: `bool` of add result
+        """
+
+        raise NotImplementedError()
+
     def delete_collection(self, name: str) -> bool:
         """
         Delete a collection
@@ -20,7 +20,7 @@
 ###############################################################################
 
 import logging
-from requests import Session
+from requests import Session, codes
 from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
 
@@ -29,6 +29,18 @@ from wis2box.env import API_BACKEND_TYPE, API_BACKEND_URL, DOCKER_API_URL
 
 LOGGER = logging.getLogger(__name__)
 
+# shared across config instances so that connections are pooled between
+# calls to wis2box.api.load_config
+HTTP = Session()
+_retry_strategy = Retry(
+    total=4,
+    status_forcelist=[429, 500, 502, 503, 504],
+    backoff_factor=2
+)
+_adapter = HTTPAdapter(max_retries=_retry_strategy)
+HTTP.mount('https://', _adapter)
+HTTP.mount('http://', _adapter)
+
 
 class PygeoapiConfig(BaseConfig):
     """Abstract API config"""
@@ -42,15 +54,7 @@ class PygeoapiConfig(BaseConfig):
 
         super().__init__(defs)
         self.url = f'{DOCKER_API_URL}/admin/resources'
-        self.http = Session()
-        retry_strategy = Retry(
-            total=4,
-            status_forcelist=[429, 500, 502, 503, 504],
-            backoff_factor=2
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.http.mount('https://', adapter)
-        self.http.mount('http://', adapter)
+        self.http = HTTP
 
     def add_collection(self, name: str, collection: dict) -> bool:
         """
@@ -62,11 +66,42 @@ class PygeoapiConfig(BaseConfig):
         :returns: `bool` of add result
         """
 
-        if self.has_collection(name):
+        # try creating the resource first, which saves an existence probe
+        # in the common case; pygeoapi rejects POSTs with a 400, in which
+        # case an existing resource is updated instead
+        content = {name: collection}
+        r = self.http.post(self.url, json=content)
+
+        if r.status_code == codes.bad_request:
+            if not self.has_collection(name):
+                LOGGER.error(f'Unable to add resource {name}: {r.text}')
+                r.raise_for_status()
+
+            LOGGER.debug(f'Resource {name} exists; updating')
             r = self.http.put(f'{self.url}/{name}', json=collection)
-        else:
-            content = {name: collection}
-            r = self.http.post(self.url, json=content)
+
+        r.raise_for_status()
+        return r.ok
+
+    def add_collections(self, collections: dict) -> bool:
+        """
+        Add a number of collections in a single request
+
+        :param collections: `dict` of collection properties keyed by
+                            collection name
+
+        :returns: `bool` of add result
+        """
+
+        if not collections:
+            return True
+
+        r = self.http.post(self.url, json=collections)
+
+        if r.status_code == codes.bad_request:
+            LOGGER.debug('Batch rejected; adding collections one by one')
+            return all(self.add_collection(name, collection)
+                       for name, collection in collections.items())
 
         r.raise_for_status()
         return r.ok
@@ -21,16 +21,14 @@
 
 import csv
 from datetime import datetime
-from io import StringIO
-import json
+from io import BytesIO, TextIOWrapper
+from itertools import islice
 import logging
 from pathlib import Path
-import requests
-from typing import Union
+from typing import Iterator, Tuple, Union
 
+from wis2box.api import upsert_collection_items
 from wis2box.data.geojson import ObservationDataGeoJSON
-from wis2box.util import to_json
-from wis2box.env import API_BACKEND_URL
 
 LOGGER = logging.getLogger(__name__)
 
@@ -41,79 +39,136 @@ class ObservationDataCSV(ObservationDataGeoJSON):
     def transform(self, input_data: Union[Path, bytes],
                   filename: str = '') -> bool:
 
+        self.output_data.update(self.transform_iter(input_data, filename))
+
+    def transform_iter(self, input_data: Union[Path, bytes],
+                       filename: str = '') -> Iterator[Tuple[str, dict]]:
+        """
+        Transform data one observation at a time
+
+        :param input_data: `pathlib.Path` or `bytes` of CSV data
+        :param filename: `str` of filename, prefixed by datastream id
+
+        :returns: generator of (`str` identifier, `dict` output data)
+        """
+
         LOGGER.debug('Procesing data')
-        input_bytes = self.as_bytes(input_data)
-
-        fh = StringIO(input_bytes.decode())
-        reader = csv.reader(fh, delimiter=',', quoting=csv.QUOTE_NONNUMERIC)
-
-        # read in header rows
-        rows_read = 0
-        skip = 7
-        while rows_read <= skip:
-            row = next(reader)
-            if rows_read == 3:
-                loc_names = row
-            elif rows_read == 4:
-                loc = row
-            elif rows_read == skip:
-                col_names = row
-            rows_read += 1
-
-        location = dict(zip(loc_names, loc))
-        location['Coordinates'] = location.get('Coordinates (long, lat)', loc[2])  # noqa
-        location['Coordinates'] = location['Coordinates'].replace('(', '[')
-        location['Coordinates'] = location['Coordinates'].replace(')', ']')
-        LOGGER.debug(location['Coordinates'])
-        location['Coordinates'] = json.loads(location['Coordinates'])
-        LOGGER.debug('Processing data from ' + location['Location'])
-
-        for row in reader:
-            data_dict = dict(zip(col_names, row))
-
-            datastream = filename.split('_').pop(0)
-            isodate = datetime.strptime(
-                data_dict.get('Datetime (UTC)'), '%Y-%m-%d %H:%M:%S'
-            )
-            data_date = isodate.strftime('%Y-%m-%dT%H:%M:%SZ')
-            isodate = isodate.strftime('%Y%m%dT%H%M%S')
-
-            try:
-                result = float(data_dict['Result'])
-            except ValueError:
-                result = data_dict['Result']
-
-            identifier = f'{datastream}_{isodate}'
-            LOGGER.debug(f'Publishing with ID {identifier}')
-            self.output_data[identifier] = {
-                '_meta': {
-                    'identifier': identifier,
-                    'data_date': data_date,
-                    'relative_filepath': self.get_local_filepath(data_date)
-                },
-                'geojson': {
-                    'phenomenonTime': data_date,
-                    'resultTime': data_date,
-                    'result': result,
-                    'Datastream': {'@iot.id': datastream},
-                    'FeatureOfInterest': {
-                        '@iot.id': datastream,
-                        'name': location.get('Location'),
-                        'description': data_dict.get('Parameter'),
-                        'encodingType': 'application/vnd.geo+json',
-                        'feature': {
-                            'type': 'Point',
-                            'coordinates': location['Coordinates']
-                        }
-                    },
+        if isinstance(input_data, Path):
+            fh = input_data.open(encoding='utf-8', newline='')
+        else:
+            input_bytes = self.as_bytes(input_data)
+            fh = TextIOWrapper(BytesIO(input_bytes), encoding='utf-8',
+                               newline='')
+
+        with fh:
+            reader = csv.reader(fh, delimiter=',',
+                                quoting=csv.QUOTE_NONNUMERIC)
+
+            # read in header rows: location names and values are on the
+            # 4th and 5th rows, data column names on the 8th
+            header = list(islice(reader, 8))
+            loc_names, loc, col_names = header[3], header[4], header[7]
+            del header
+
+            location = dict(zip(loc_names, loc))
+            location['Coordinates'] = location.get('Coordinates (long, lat)', loc[2])  # noqa
+            LOGGER.debug(location['Coordinates'])
+            # coordinates are formatted as '(long, lat)'
+            lon, lat = location['Coordinates'].strip('() ').split(',')
+            location['Coordinates'] = [float(lon), float(lat)]
+            LOGGER.debug('Processing data from ' + location['Location'])
+
+            # resolve column positions once rather than per row
+            columns = {name: i for i, name in enumerate(col_names)}
+            datetime_col = columns['Datetime (UTC)']
+            result_col = columns['Result']
+            parameter_col = columns.get('Parameter')
+
+            # the datastream and feature of interest are the same for every
+            # row apart from the description, so build them once and share
+            # them between observations
+            datastream = filename.split('_', 1)[0]
+            datastream_ref = {'@iot.id': datastream}
+            foi = {
+                '@iot.id': datastream,
+                'name': location['Location'],
+                'description': None,
+                'encodingType': 'application/vnd.geo+json',
+                'feature': {
+                    'type': 'Point',
+                    'coordinates': location['Coordinates']
                 }
             }
 
+            # local aliases avoid attribute lookups in the row loop
+            fromisoformat = datetime.fromisoformat
+            get_local_filepath = self.get_local_filepath
+            # relative filepaths only vary by day
+            filepaths = {}
+            # features of interest only vary by description
+            fois = {None: foi}
+
+            for row in reader:
+                # 'YYYY-MM-DD HH:MM:SS' is valid ISO 8601, so avoid the
+                # much slower strptime
+                datetime_ = row[datetime_col]
+                isodate = fromisoformat(datetime_)
+                # fromisoformat also accepts dates, fractional seconds and
+                # UTC offsets, which the strptime format rejected
+                if len(datetime_) != 19 or isodate.tzinfo is not None:
+                    raise ValueError(f'Invalid UTC datetime: {datetime_}')
+                # the validated value is laid out field by field, so
+                # slicing is far cheaper than two strftime calls
+                data_date = f'{datetime_[:10]}T{datetime_[11:]}Z'
+                isodate = (f'{datetime_[:4]}{datetime_[5:7]}'
+                           f'{datetime_[8:10]}T{datetime_[11:13]}'
+                           f'{datetime_[14:16]}{datetime_[17:]}')
+
+                # unquoted values are already coerced to float by the
+                # QUOTE_NONNUMERIC reader
+                result = row[result_col]
+                if not isinstance(result, float):
+                    try:
+                        result = float(result)
+                    except ValueError:
+                        pass
+
+                day = data_date[:10]
+                relative_filepath = filepaths.get(day)
+                if relative_filepath is None:
+                    relative_filepath = get_local_filepath(day)
+                    filepaths[day] = relative_filepath
+
+                if parameter_col is None:
+                    description = None
+                else:
+                    description = row[parameter_col]
+                feature_of_interest = fois.get(description)
+                if feature_of_interest is None:
+                    feature_of_interest = {**foi, 'description': description}
+                    fois[description] = feature_of_interest
+
+                identifier = f'{datastream}_{isodate}'
+                LOGGER.debug('Publishing with ID %s', identifier)
+                yield identifier, {
+                    '_meta': {
+                        'identifier': identifier,
+                        'data_date': data_date,
+                        'relative_filepath': relative_filepath
+                    },
+                    'geojson': {
+                        'phenomenonTime': data_date,
+                        'resultTime': data_date,
+                        'result': result,
+                        'Datastream': datastream_ref,
+                        'FeatureOfInterest': feature_of_interest,
+                    }
+                }
+
     def publish(self) -> bool:
         LOGGER.info('Publishing output data')
 
-        batch_request = {'requests': []}
-        request_id = 0
+        items = []
         for identifier, item in self.output_data.items():
             for format_, the_data in item.items():
                 if format_ == '_meta':
@@ -126,33 +181,13 @@ class ObservationDataCSV(ObservationDataGeoJSON):
                     LOGGER.warning(msg)
                     continue
 
-                LOGGER.debug('Preparing data for batch request')
-
-                batch_request['requests'].append({
-                    'id': str(request_id),
-                    'method': 'post',
-                    'url': 'Observations',
-                    'body': the_data
-                })
-                request_id += 1
-
-        try:
-            r = requests.post(
-                f'{API_BACKEND_URL}/$batch',
-                data=to_json(batch_request),
-                headers={'Content-Type': 'application/json'}
-            )
-
-            # Check the response status
-            if r.status_code == 200:
-                LOGGER.info('Successfully published all data in batch.')
-                return True
-            else:
-                msg = f'Failed to publish data: {r.status_code}, {r.text}'
-                LOGGER.error(msg)
-                return False
-        except Exception as e:
-            LOGGER.error(f'Exception occurred: {e}')
+                items.append(the_data)
+
+        LOGGER.debug(f'Publishing {len(items)} items')
+        if upsert_collection_items('Observations', items):
+            LOGGER.info('Successfully published all data in batch.')
+            return True
+        else:
             return False
 
     def __repr__(self):
@@ -19,10 +19,12 @@
 #
 ###############################################################################
 
-from concurrent.futures import ProcessPoolExecutor, as_completed
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import click
 import csv
 from datetime import datetime, timedelta
+import httpx
 from json.decoder import JSONDecodeError
 import logging
 from pathlib import Path
@@ -43,6 +45,13 @@ LOGGER = logging.getLogger(__name__)
 STATION_METADATA = DATADIR / 'metadata' / 'station'
 STATIONS = STATION_METADATA / 'location_data.csv'
 
+# result downloads in flight at once against RISE
+MAX_CONCURRENT_REQUESTS = 16
+# stations synchronized concurrently by the ingest command; each runs its
+# own event loop, so they split the download budget between them
+MAX_WORKERS = 4
+REQUESTS_PER_WORKER = MAX_CONCURRENT_REQUESTS // MAX_WORKERS
+
 
 def gcm() -> dict:
     """
@@ -126,18 +135,32 @@ class ObservationDataDownload(BaseAbstractData):
 
         return response
 
-    def transform(
-        self, input_data: Union[Path, bytes], filename: str = ''
-    ) -> bool:
-        rmk = f'{input_data}_{self.begin}_{self.end}'
-        params = {
+    def _params(self, item_id: str) -> dict:
+        """
+        Private function: Get result download query parameters
+
+        :param item_id: `str` of datastream identifier
+
+        :returns: `dict` of query parameters
+        """
+        return {
             'type': 'csv',
             'after': self.begin,
             'before': self.end,
-            'itemId': input_data,
-            'filename': f'{rmk}.csv'
+            'itemId': item_id,
+            'filename': f'{item_id}_{self.begin}_{self.end}.csv'
         }
-        data = self._get_response(RESULT_URL, params)
+
+    def _store(self, item_id: str, data) -> None:
+        """
+        Private function: Store downloaded results in incoming storage
+
+        :param item_id: `str` of datastream identifier
+        :param data: downloaded result data
+
+        :returns: `None`
+        """
+        rmk = f'{item_id}_{self.begin}_{self.end}'
         bytes = self.as_bytes(data)
 
         if 'No data' in str(bytes):
@@ -149,6 +172,56 @@ class ObservationDataDownload(BaseAbstractData):
 
             LOGGER.debug('Finished processing subset')
 
+    def transform(
+        self, input_data: Union[Path, bytes], filename: str = ''
+    ) -> bool:
+        data = self._get_response(RESULT_URL, self._params(input_data))
+        self._store(input_data, data)
+
+    def transform_all(self, item_ids: list,
+                      max_concurrent: int = MAX_CONCURRENT_REQUESTS) -> None:
+        """
+        Download and store results for many datastreams concurrently
+
+        :param item_ids: `list` of datastream identifiers
+        :param max_concurrent: `int` of maximum downloads in flight
+
+        :returns: `None`
+        """
+
+        async def fetch(client, semaphore, item_id):
+            async with semaphore:
+                r = await client.get(RESULT_URL, params=self._params(item_id))
+
+                if not r.is_success:
+                    msg = f'Bad http response code: {r.url}'
+                    LOGGER.error(msg)
+                    raise RequestException(msg)
+
+                try:
+                    data = r.json()
+                except JSONDecodeError:
+                    data = r.content
+
+                # store while other downloads are in flight, so that only
+                # results being written are held in memory
+                await asyncio.to_thread(self._store, item_id, data)
+
+        async def fetch_all():
+            semaphore = asyncio.Semaphore(max_concurrent)
+            async with httpx.AsyncClient(
+                    follow_redirects=True, timeout=None) as client:
+                tasks = [fetch(client, semaphore, item_id)
+                         for item_id in item_ids]
+                return await asyncio.gather(*tasks, return_exceptions=True)
+
+        results = asyncio.run(fetch_all())
+
+        for item_id, error in zip(item_ids, results):
+            if isinstance(error, Exception):
+                LOGGER.error(item_id)
+                LOGGER.error(error)
+
     def local_filepath(self, date_):
         yyyymmdd = date_[0:10]  # date_.strftime('%Y-%m-%d')
         return Path(yyyymmdd) / self.topic_hierarchy.dirpath
@@ -157,7 +230,8 @@ class ObservationDataDownload(BaseAbstractData):
         return '<ObservationDataDownload>'
 
 
-def sync_datastreams(station_id, begin, end):
+def sync_datastreams(station_id, begin, end,
+                     max_concurrent=MAX_CONCURRENT_REQUESTS):
     url = DOCKER_API_URL + '/collections/datastreams/items'
 
     _, plugins = validate_and_load('iow.demo.Observations')
@@ -172,18 +246,15 @@ def sync_datastreams(station_id, begin, end):
     params = {'Thing': station_id, 'limit': 10000}
     datastreams = plugin._get_response(url=url, params=params)
 
-    for datastream in datastreams['features']:
-        try:
-            plugin.transform(datastream['id'], datastream['id'])
-        except Exception as err:
-            LOGGER.error(datastream['id'])
-            LOGGER.error(err)
+    plugin.transform_all(
+        [datastream['id'] for datastream in datastreams['features']],
+        max_concurrent)
 
 
 def process(row, begin, end):
     station = row['station_identifier']
     try:
-        sync_datastreams(station, begin, end)
+        sync_datastreams(station, begin, end, REQUESTS_PER_WORKER)
     except Exception as err:
         return f'{err} with {station}'
     return None
@@ -220,8 +291,9 @@ def ingest(ctx, station, begin, end, verbosity):
             reader = csv.DictReader(fh)
             rows = list(reader)
 
-        with ProcessPoolExecutor() as e:
-            futures = {e.submit(process, row, begin, end): row 
+        # station synchronization is network bound, so threads suffice
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as e:
+            futures = {e.submit(process, row, begin, end): row
                        for row in rows}
             for future in as_completed(futures):
                 error = future.result()
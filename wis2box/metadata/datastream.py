@@ -23,6 +23,7 @@ import asyncio
 import click
 import logging
 import httpx
+import orjson
 from requests import Session
 from typing import AsyncGenerator, Dict, Any
 
@@ -32,6 +33,25 @@ from wis2box.env import RISE_URL, USBR_URL
 
 LOGGER = logging.getLogger(__name__)
 
+# bound concurrent requests against the RISE API
+MAX_CONCURRENT_REQUESTS = 16
+LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=32)
+TIMEOUT = httpx.Timeout(30.0)
+
+# shared between calls so that the RISE connection is kept alive
+HTTP = Session()
+HTTP.headers.update({'accept': 'application/vnd.api+json'})
+
+OBSERVATION_TYPE = 'http://www.opengis.net/def/observationType/OGC-OM/2.0/OM_Measurement'  # noqa
+# RISE does not describe sensors, so every datastream shares this one
+SENSOR = {
+    '@iot.id': 0,
+    'name': 'Unknown',
+    'description': 'Unknown',
+    'encodingType': 'Unknown',
+    'metadata': 'Unknown'
+}
+
 
 def gcm() -> dict:
     """
@@ -58,37 +78,45 @@ def fetch_datastreams(station_id: str):
 
     :returns: `list`, of link relations for all datasets
     """
-    http = Session()
-    http.headers.update({'accept': 'application/vnd.api+json'})
 
-    location = http.get(f'{RISE_URL}/location/{station_id}').json()
+    r = HTTP.get(f'{RISE_URL}/location/{station_id}')
+    location = orjson.loads(r.content)
 
     return location['data']['relationships']['catalogItems']['data']
 
 
 async def fetch_catalog_item(client: httpx.AsyncClient,
+                             semaphore: asyncio.Semaphore,
                              dataset_id: str) -> dict:
     """
     Fetch a catalog item from the USBR RISE API asynchronously.
 
     :param client: An instance of httpx.AsyncClient.
+    :param semaphore: An asyncio.Semaphore bounding concurrent requests.
     :param dataset_id: The ID of the dataset.
     :return: The JSON response as a dictionary.
     """
-    response = await client.get(f'{USBR_URL}{dataset_id}')
-    return response.json()
+    async with semaphore:
+        response = await client.get(f'{USBR_URL}{dataset_id}')
+
+    return orjson.loads(response.content)
 
 
 async def yield_datastreams(
-        datasets: dict) -> AsyncGenerator[Dict[str, Any], None]:
+        datasets: dict, max_concurrent: int = MAX_CONCURRENT_REQUESTS
+) -> AsyncGenerator[Dict[str, Any], None]:
     """
     Yield datasets from USBR RISE API asynchronously.
 
+    :param datasets: `list` of RISE catalog item relations
+    :param max_concurrent: `int` of maximum catalog item requests in flight
+
     :returns: An iterable of link relations for all datasets.
     """
-    async with httpx.AsyncClient() as client:
+    semaphore = asyncio.Semaphore(max_concurrent)
+    async with httpx.AsyncClient(limits=LIMITS, timeout=TIMEOUT) as client:
         tasks = [
-            fetch_catalog_item(client, dataset['id'])
+            fetch_catalog_item(client, semaphore, dataset['id'])
             for dataset in datasets
         ]
         catalog_items = await asyncio.gather(*tasks)
@@ -103,7 +131,7 @@ async def yield_datastreams(
                 '@iot.id': attrs['_id'],
                 'name': attrs['itemTitle'],
                 'description': attrs['itemDescription'],
-                'observationType': 'http://www.opengis.net/def/observationType/OGC-OM/2.0/OM_Measurement',  # noqa
+                'observationType': OBSERVATION_TYPE,
                 'properties': {
                     'RISE.selfLink': f"{USBR_URL}{catalog_item['data']['id']}"
                 },
@@ -118,26 +146,25 @@ async def yield_datastreams(
                     'description': attrs['parameterName'],
                     'definition': f'{RISE_URL}/parameter/{parameter_id}'
                 },
-                'Sensor': {
-                    '@iot.id': 0,
-                    'name': 'Unknown',
-                    'description': 'Unknown',
-                    'encodingType': 'Unknown',
-                    'metadata': 'Unknown'
-                }
+                'Sensor': SENSOR
             }
 
 
-def load_datastreams(station_id: str):
+def load_datastreams(station_id: str,
+                     max_concurrent: int = MAX_CONCURRENT_REQUESTS):
     """
     Load datasets from USBR RISE API
 
+    :param station_id: `str` of RISE location identifier
+    :param max_concurrent: `int` of maximum catalog item requests in flight
+
     :returns: `list`, of link relations for all datasets
     """
 
     async def get_datastreams():
+        datasets = fetch_datastreams(station_id)
         return [datastream async for datastream in
-                yield_datastreams(fetch_datastreams(station_id))]
+                yield_datastreams(datasets, max_concurrent)]
 
     return asyncio.run(get_datastreams())
 
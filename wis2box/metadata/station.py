@@ -28,7 +28,7 @@ from owslib.ogcapi.features import Features
 from pygeometa.schemas.wmo_wigos import WMOWIGOSOutputSchema
 
 from wis2box import cli_helpers
-from wis2box.api import setup_collection, upsert_collection_item
+from wis2box.api import setup_collection, upsert_collection_items
 from wis2box.env import DATADIR, DOCKER_API_URL
 from wis2box.metadata.base import BaseMetadata
 from wis2box.util import get_typed_value
@@ -153,6 +153,7 @@ def publish_station_collection() -> None:
 
     oscar_baseurl = 'https://oscar.wmo.int/surface/#/search/station/stationReportDetails'  # noqa
 
+    features = []
     with STATIONS.open() as fh:
         reader = csv.DictReader(fh)
 
@@ -185,8 +186,10 @@ def publish_station_collection() -> None:
                 'links': topics
             }
 
-            LOGGER.debug('Publishing to backend')
-            upsert_collection_item('stations', feature)
+            features.append(feature)
+
+    LOGGER.debug(f'Publishing {len(features)} stations to backend')
+    upsert_collection_items('stations', features)
 
     return
 
@@ -20,17 +20,21 @@
 ###############################################################################
 
 import click
+from concurrent.futures import ThreadPoolExecutor
 import csv
-import multiprocessing as mp
 import logging
-from requests import Session
-from time import sleep
+import orjson
+from requests import Request, Session
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.util.retry import Retry
+from typing import Iterator, Union
 
 from wis2box import cli_helpers
-from wis2box.api import (setup_collection, upsert_collection_item,
+from wis2box.api import (setup_collections, upsert_collection_items,
                          delete_collection_item)
 from wis2box.env import DATADIR, RISE_URL, USBR_URL
-from wis2box.metadata.datastream import load_datastreams, gcm
+from wis2box.metadata.datastream import (load_datastreams, gcm,
+                                         MAX_CONCURRENT_REQUESTS)
 from wis2box.util import get_typed_value, url_join
 
 LOGGER = logging.getLogger(__name__)
@@ -39,6 +43,21 @@ STATION_METADATA = DATADIR / 'metadata' / 'station'
 STATIONS = STATION_METADATA / 'location_data.csv'
 THINGS = 'Things'
 
+# stations built concurrently; each runs its own event loop for the RISE
+# catalog items, so they split the request budget between them
+MAX_WORKERS = 4
+REQUESTS_PER_WORKER = MAX_CONCURRENT_REQUESTS // MAX_WORKERS
+
+HTTP = Session()
+_retry_strategy = Retry(
+    total=3,
+    status_forcelist=[429, 500, 502, 503, 504],
+    backoff_factor=0.2
+)
+_adapter = HTTPAdapter(max_retries=_retry_strategy)
+HTTP.mount('https://', _adapter)
+HTTP.mount('http://', _adapter)
+
 
 def gcm_() -> dict:
     """
@@ -65,31 +84,46 @@ def thing():
     pass
 
 
-def handle_row(row) -> None:
-    station_identifier = row.pop('station_identifier')
+def handle_row(row: dict) -> Union[dict, None]:
+    """
+    Builds a Thing, with its Datastreams, from a station row
+
+    :param row: `dict` of station metadata
+
+    :returns: `dict` of Thing, or `None` if it cannot be published
+    """
+
+    station_identifier = row.pop('station_identifier', None)
     try:
-        datastreams = list(load_datastreams(station_identifier))
-        datastreams[0]
+        datastreams = load_datastreams(station_identifier,
+                                       REQUESTS_PER_WORKER)
+        if not datastreams:
+            LOGGER.error(f'Unable to publish {station_identifier} - no datastreams')  # noqa
+            return None
+
+        station_name = row['station_name']
+        coordinates = [
+            get_typed_value(row.pop('longitude')),
+            get_typed_value(row.pop('latitude')),
+            get_typed_value(row.pop('elevation'))
+        ]
     except Exception as err:
         LOGGER.error(f'Unable to publish {station_identifier} - {err}')
-        return
+        return None
 
-    feature = {
+    return {
         '@iot.id': station_identifier,
-        'name': row['station_name'],
-        'description': row['station_name'],
+        'name': station_name,
+        'description': station_name,
         'Locations': [{
             '@iot.id': station_identifier,
-            'name': row['station_name'],
-            'description': row['station_name'],
+            'name': station_name,
+            'description': station_name,
             'encodingType': 'application/vnd.geo+json',
             'location': {
                 'type': 'Point',
-                'coordinates': [
-                    get_typed_value(row.pop('longitude')),
-                    get_typed_value(row.pop('latitude')),
-                    get_typed_value(row.pop('elevation'))
-                ]}
+                'coordinates': coordinates
+            }
         }],
         'Datastreams': datastreams,
         'properties': {
@@ -98,29 +132,28 @@ def handle_row(row) -> None:
         }
     }
 
-    LOGGER.debug('Publishing to backend')
-    upsert_collection_item(THINGS, feature)
-
 
-def publish_station_collection() -> None:
+def publish_station_collection() -> bool:
     """
     Publishes station collection to API config and backend
 
-    :returns: `None`
+    :returns: `bool` of publish result
     """
 
-    setup_collection(meta=gcm_())
-    setup_collection(meta=gcm())
+    setup_collections([gcm_(), gcm()])
 
     with STATIONS.open() as fh:
         reader = csv.DictReader(fh)
 
-        for row in reader:
-            while len(mp.active_children()) == mp.cpu_count():
-                sleep(0.1)
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            features = [feature for feature in
+                        executor.map(handle_row, reader)
+                        if feature is not None]
 
-            p = mp.Process(target=handle_row, args=(row,))
-            p.start()
+    LOGGER.debug('Publishing to backend')
+    if not upsert_collection_items(THINGS, features):
+        LOGGER.error(f'Unable to publish all {len(features)} {THINGS}')
+        return False
 
     return True
 
@@ -131,8 +164,64 @@ def publish_station_collection() -> None:
 def publish_collection(ctx, verbosity):
     """Publishes collection of stations to API config and backend"""
 
-    publish_station_collection()
-    click.echo('Done')
+    if not publish_station_collection():
+        click.echo('Unable to publish all stations')
+    else:
+        click.echo('Done')
+
+
+def iter_stations(url: str) -> Iterator[dict]:
+    """
+    Yields stations from the paginated RISE location endpoint
+
+    :param url: `str` of the first page URL
+
+    :returns: generator of `dict` of station data
+    """
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        next_page = executor.submit(HTTP.get, url)
+
+        while next_page is not None:
+            response = orjson.loads(next_page.result().content)
+
+            # Fetch the next page while this one is processed
+            links = response.get('links', {})
+            if 'next' in links:
+                url = url_join(USBR_URL, links['next'])
+                next_page = executor.submit(HTTP.get, url)
+            else:
+                next_page = None
+
+            # Extract station data
+            for station in response.get('data', []):
+                attributes = station['attributes']
+                location = attributes['locationCoordinates']
+                if location['type'] != 'Point':
+                    continue
+
+                coordinates = location['coordinates']
+                try:
+                    station_data = {
+                        'station_identifier': attributes['_id'],
+                        'station_name': attributes['locationName'],
+                        'description': attributes.get(
+                            'locationDescription', ''),
+                        'latitude': coordinates[1],
+                        'longitude': coordinates[0],
+                        'elevation': attributes['elevation'],
+                        'create_date': attributes['createDate'],
+                        'update_date': attributes['updateDate'],
+                        'timezone': attributes['timezone'],
+                        'type': attributes['locationTypeName'],
+                        'region': ','.join(
+                            attributes.get('locationRegionNames', [])),
+                    }
+                except IndexError as err:
+                    click.echo(err)
+                    click.echo(station)
+                    continue
+                yield station_data
 
 
 @click.command()
@@ -140,60 +229,25 @@ def publish_collection(ctx, verbosity):
 @cli_helpers.OPTION_VERBOSITY
 def cache_stations(ctx, verbosity):
     """Caches collection of stations to API config and backend"""
-    http = Session()
-    all_stations = []
     params = {
         'hasCatalogItems': 'true',
         'order[id]': 'asc'
     }
     _ = url_join(RISE_URL, 'location')
-    url = http.get(_, params=params).url
-
-    while url:
-        r = http.get(url)
-        response = r.json()
-
-        # Extract station data
-        for station in response.get('data', []):
-            attributes = station['attributes']
-            if attributes['locationCoordinates']['type'] != 'Point':
-                continue
-
-            coordinates = attributes['locationCoordinates']['coordinates']
-            try:
-                station_data = {
-                    'station_identifier': attributes['_id'],
-                    'station_name': attributes['locationName'],
-                    'description': attributes.get('locationDescription', ''),
-                    'latitude': coordinates[1],
-                    'longitude': coordinates[0],
-                    'elevation': attributes['elevation'],
-                    'create_date': attributes['createDate'],
-                    'update_date': attributes['updateDate'],
-                    'timezone': attributes['timezone'],
-                    'type': attributes['locationTypeName'],
-                    'region': ','.join(
-                        attributes.get('locationRegionNames', [])),
-                }
-            except IndexError as err:
-                click.echo(err)
-                click.echo(station)
-                continue
-            all_stations.append(station_data)
-
-        # Get the next URL from the response
-        links = response.get('links', {})
-        url = url_join(USBR_URL, links.get('next')) \
-            if 'next' in links else None
+    url = Request('GET', _, params=params).prepare().url
 
-    # Write station data to CSV
+    # Write station data to CSV as each page arrives, replacing the
+    # existing file only once every page has been read
     fieldnames = ['station_identifier', 'station_name', 'description',
                   'latitude', 'longitude', 'elevation', 'create_date',
                   'update_date', 'timezone', 'type', 'region']
-    with open(STATIONS, mode='w', newline='') as file:
+    stations_tmp = STATIONS.with_suffix('.tmp')
+    with stations_tmp.open(mode='w', newline='') as file:
         writer = csv.DictWriter(file, fieldnames=fieldnames)
         writer.writeheader()
-        writer.writerows(all_stations)
+        writer.writerows(iter_stations(url))
+
+    stations_tmp.replace(STATIONS)
 
 
 @click.command()
@@ -203,10 +257,18 @@ def delete_collection(ctx, verbosity):
     """Publishes collection of stations to API config and backend"""
 
     with STATIONS.open() as fh:
-        reader = csv.DictReader(fh)
+        reader = csv.reader(fh)
+        header = next(reader, None)
+        if header is None:
+            click.echo('Done')
+            return
 
+        station_identifier = header.index('station_identifier')
         for row in reader:
-            delete_collection_item(THINGS, row['station_identifier'])
+            # DictReader skipped blank lines, csv.reader yields []
+            if not row:
+                continue
+            delete_collection_item(THINGS, row[station_identifier])
 
     click.echo('Done')
 
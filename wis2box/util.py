@@ -26,6 +26,7 @@ import hashlib
 import isodate
 import json
 import logging
+import orjson
 import os
 from pathlib import Path
 import re
@@ -36,6 +37,9 @@ import yaml
 
 LOGGER = logging.getLogger(__name__)
 
+WORD_PATTERN = re.compile(r'\w+')
+COORD_PATTERN = re.compile(r'[-\d\.]+')
+
 
 def get_typed_value(value) -> Union[float, int, str]:
     """
@@ -78,6 +82,18 @@ def to_json(dict_: dict, pretty: bool = False) -> str:
                       separators=(',', ':'))
 
 
+def to_json_bytes(dict_: dict) -> bytes:
+    """
+    Serialize dict to compact UTF-8 encoded JSON
+
+    :param dict_: `dict` of JSON representation
+
+    :returns: JSON `bytes` representation
+    """
+
+    return orjson.dumps(dict_, default=json_serial)
+
+
 def json_serial(obj: object) -> Union[bytes, str, float]:
     """
     helper function to convert to JSON non-default
@@ -250,7 +266,7 @@ def clean_word(input: str, delim: str = ' ') -> str:
 
     :returns: str of resulting uuid
     """
-    return delim.join(re.findall(r'\w+', input))
+    return delim.join(WORD_PATTERN.findall(input))
 
 
 def url_join(*parts: str) -> str:
@@ -293,4 +309,4 @@ def extract_coord(p):
 
     :returns: types coordinate value
     """
-    return get_typed_value(''.join(re.findall(r'[-\d\.]+', p)))
+    return get_typed_value(''.join(COORD_PATTERN.findall(p)))